@@ -1,15 +1,26 @@
+from bisect import bisect_right
 from dataclasses import dataclass
 
 import math
-import time
-from datetime import timedelta
-from functools import lru_cache
+import sys
+from functools import lru_cache, partial
+from pathlib import Path
 
+import numpy as np
 
-# START_IDX = 0
-# START_SEED = 1247895974
-# MIN_VAL = 393472033
-# SPENT_DURATION = 699.8467710018158
+# the shared tooling lives at the root of the repository
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from aoc.scan import scan_ranges  # noqa: E402
+
+# single process brute force: 699.8 seconds
+BRUTE_FORCE_CHECKPOINT = "brute_force.checkpoint"
+
+
+Interval = tuple[int, int]
+Piece = tuple[int, int, int]  # start, end, offset
+
+# upper bound of the values handled by the composed map
+MAX_VALUE = 2**63
 
 
 @dataclass
@@ -23,6 +34,14 @@ class ConversionRange:
             return value - self.source_range_start + self.dest_range_start
         return None
 
+    @property
+    def source_range_end(self) -> int:
+        return self.source_range_start + self.range
+
+    @property
+    def offset(self) -> int:
+        return self.dest_range_start - self.source_range_start
+
     def __hash__(self):
         return hash((self.dest_range_start, self.source_range_start, self.range))
 
@@ -38,10 +57,95 @@ class ConversionMap:
                 return conv_value
         return value
 
+    def split_ranges(self, ranges: list[Interval]) -> list[Piece]:
+        """Split intervals on range boundaries, with the offset of each piece."""
+        conversions = sorted(self.conversions, key=lambda c: c.source_range_start)
+        res = []
+        for start, end in ranges:
+            for conv_range in conversions:
+                if start >= end:
+                    break
+                if conv_range.source_range_end <= start:
+                    continue
+                if end <= conv_range.source_range_start:
+                    break
+                if start < conv_range.source_range_start:
+                    # gap before this conversion range is left unchanged
+                    res.append((start, conv_range.source_range_start, 0))
+                    start = conv_range.source_range_start
+
+                overlap_end = min(end, conv_range.source_range_end)
+                res.append((start, overlap_end, conv_range.offset))
+                start = overlap_end
+            if start < end:
+                res.append((start, end, 0))
+        return res
+
+    def convert_ranges(self, ranges: list[Interval]) -> list[Interval]:
+        """Map whole `[start, end)` intervals, shifting each piece of
+        `split_ranges`."""
+        return [
+            (start + offset, end + offset)
+            for start, end, offset in self.split_ranges(ranges)
+        ]
+
+    def to_arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Source starts, source ends and offsets sorted by source start."""
+        conversions = sorted(self.conversions, key=lambda c: c.source_range_start)
+        return (
+            np.array([c.source_range_start for c in conversions], dtype=np.int64),
+            np.array([c.source_range_end for c in conversions], dtype=np.int64),
+            np.array([c.offset for c in conversions], dtype=np.int64),
+        )
+
     def __hash__(self):
         return hash(self.name)
 
 
+@dataclass
+class PiecewiseMap:
+    """Piecewise-linear map: `[starts[i], starts[i + 1])` shifts by `offsets[i]`."""
+
+    starts: list[int]
+    offsets: list[int]
+
+    @staticmethod
+    def compose(conv_maps: list[ConversionMap]) -> "PiecewiseMap":
+        """Fold a chain of conversion maps into a single breakpoint table."""
+        pieces = [(0, MAX_VALUE, 0)]
+        for conv_map in conv_maps:
+            next_pieces = []
+            for start, end, offset in pieces:
+                # split the image of the piece, then bring the splits back
+                image = [(start + offset, end + offset)]
+                for sub_start, sub_end, sub_offset in conv_map.split_ranges(image):
+                    next_pieces.append(
+                        (sub_start - offset, sub_end - offset, offset + sub_offset)
+                    )
+            pieces = next_pieces
+
+        pieces.sort()
+        starts, offsets = [], []
+        for start, _, offset in pieces:
+            # merge neighbors with the same shift
+            if offsets and offsets[-1] == offset:
+                continue
+            starts.append(start)
+            offsets.append(offset)
+        return PiecewiseMap(starts, offsets)
+
+    def convert(self, value: int) -> int:
+        return value + self.offsets[bisect_right(self.starts, value) - 1]
+
+    def convert_many(self, values: list[int]) -> list[int]:
+        starts, offsets = self.starts, self.offsets
+        return [value + offsets[bisect_right(starts, value) - 1] for value in values]
+
+    def pieces(self) -> list[Piece]:
+        ends = self.starts[1:] + [MAX_VALUE]
+        return list(zip(self.starts, ends, self.offsets))
+
+
 # @lru_cache(maxsize=128)
 def seed_to_location(seed: int, conv_maps: list[ConversionMap]) -> int:
     for conv_map in conv_maps:
@@ -49,6 +153,76 @@ def seed_to_location(seed: int, conv_maps: list[ConversionMap]) -> int:
     return seed
 
 
+def ranges_to_location(ranges: list[Interval], conv_maps: list[ConversionMap]):
+    for conv_map in conv_maps:
+        ranges = conv_map.convert_ranges(ranges)
+    return ranges
+
+
+def convert_array(
+    values: np.ndarray, starts: np.ndarray, ends: np.ndarray, offsets: np.ndarray
+) -> np.ndarray:
+    idx = np.searchsorted(starts, values, side="right") - 1
+    clipped = np.maximum(idx, 0)
+    covered = (idx >= 0) & (values < ends[clipped])
+    return values + np.where(covered, offsets[clipped], 0)
+
+
+@dataclass
+class RangeStats:
+    start: int
+    length: int
+    min_location: int
+    max_location: int
+    mean_location: float
+
+
+def batch_seed_to_location(
+    seed_ranges: list[Interval],
+    conv_maps: list[ConversionMap],
+    chunk_size: int = 1 << 20,
+    with_stats: bool = False,
+) -> tuple[int, list[RangeStats] | None]:
+    """Min location of the seed ranges, and per-range stats if `with_stats`."""
+    map_arrays = [conv_map.to_arrays() for conv_map in conv_maps]
+
+    best_location = math.inf
+    range_stats = [] if with_stats else None
+    for range_start, range_end in seed_ranges:
+        min_location, max_location, location_sum = math.inf, -math.inf, 0
+        for chunk_start in range(range_start, range_end, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, range_end)
+            values = np.arange(chunk_start, chunk_end, dtype=np.int64)
+            for arrays in map_arrays:
+                values = convert_array(values, *arrays)
+            min_location = min(min_location, int(values.min()))
+            if with_stats:
+                max_location = max(max_location, int(values.max()))
+                location_sum += int(values.sum())
+
+        best_location = min(best_location, min_location)
+        if with_stats:
+            length = range_end - range_start
+            range_stats.append(
+                RangeStats(
+                    range_start,
+                    length,
+                    min_location,
+                    max_location,
+                    location_sum / length if length else math.nan,
+                )
+            )
+
+    return best_location, range_stats
+
+
+def get_seed_ranges(seed_data: list[int]) -> list[Interval]:
+    return [
+        (seed_data[idx * 2], seed_data[idx * 2] + seed_data[idx * 2 + 1])
+        for idx in range(len(seed_data) // 2)
+    ]
+
+
 def parse_data(input_str: str) -> tuple[list[int], list[ConversionMap]]:
     seed_block, *conv_blocks = input_str.split("\n\n")
 
@@ -74,7 +248,7 @@ def resolve1():
         input_str = f.read()
 
     seeds, conv_maps = parse_data(input_str)
-    return min(seed_to_location(seed, conv_maps) for seed in seeds)
+    return min(PiecewiseMap.compose(conv_maps).convert_many(seeds))
 
 
 def resolve2():
@@ -82,46 +256,35 @@ def resolve2():
         input_str = f.read()
 
     seed_data, conv_maps = parse_data(input_str)
+    location_ranges = ranges_to_location(get_seed_ranges(seed_data), conv_maps)
+    return min(start for start, _ in location_ranges)
 
-    seeds = (
-        seed
-        for idx in range(0, len(seed_data) // 2)
-        for seed in range(
-            seed_data[idx * 2], seed_data[idx * 2] + seed_data[idx * 2 + 1]
-        )
+
+def min_location_in_range(start: int, length: int, conv_maps: list[ConversionMap]):
+    return min(
+        seed_to_location(seed, conv_maps) for seed in range(start, start + length)
     )
 
-    seed_count = sum(seed_data[idx * 2 + 1] for idx in range(len(seed_data) // 2))
-
-    op_count = 0
-    start_time = time.time()
-    try:
-        min_val = math.inf
-        for _idx in list(range(len(seed_data) // 2)):
-            start_seed = seed_data[_idx * 2]
-            seed_range = seed_data[_idx * 2 + 1]
-            for seed in range(start_seed, start_seed + seed_range):
-                val = seed_to_location(seed, conv_maps)
-                min_val = min(val, min_val)
-                op_count += 1
-
-                if op_count % 1_000_000 == 0:
-                    ratio = op_count / seed_count
-                    eta = (time.time() - start_time) / ratio
-                    eta_str = str(timedelta(seconds=int(eta)))
-
-                    print(
-                        f"op_count: {op_count},\tpercent: {ratio * 100:.2f}%\tETA: {eta_str}"
-                    )
 
-    except KeyboardInterrupt:
-        print(
-            f"idx: {_idx}, seed: {seed}, min_val: {min_val}, duration: {str(timedelta(seconds=time.time() - start_time))}"
-        )
+def brute_force_resolve2(workers: int | None = None):
+    """Seed by seed `resolve2` over a process pool, resumable from a checkpoint."""
+    with open("2023/05/input.txt") as f:
+        input_str = f.read()
 
-    return min_val
-    # return sum(1 for _ in seeds)
-    # return min(seed_to_location(seed, conv_maps) for seed in seeds)
+    seed_data, conv_maps = parse_data(input_str)
+    seed_ranges = [
+        (seed_data[idx * 2], seed_data[idx * 2 + 1])
+        for idx in range(len(seed_data) // 2)
+    ]
+    return scan_ranges(
+        partial(min_location_in_range, conv_maps=conv_maps),
+        seed_ranges,
+        combine=min,
+        initial=math.inf,
+        checkpoint_path=Path(__file__).resolve().parent / BRUTE_FORCE_CHECKPOINT,
+        workers=workers,
+        key=Path(__file__).read_bytes(),
+    )
 
 
 if __name__ == "__main__":
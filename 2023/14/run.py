@@ -5,6 +5,7 @@ from pprint import pprint
 import numpy as np
 
 CACHE_SIZE = 32768
+SPIN_CYCLE_COUNT = 1_000_000_000
 
 
 def parse_input(path: str):
@@ -12,9 +13,63 @@ def parse_input(path: str):
     return tuple(p.read_text().splitlines())
 
 
-def to_numpy(grid):
-    repl = {"#": -1, "O": 1, ".": 0}
-    return np.array([[repl[elt] for elt in row]] for row in grid)
+CUBE, EMPTY, ROUND = -1, 0, 1
+
+
+def to_numpy(grid) -> np.ndarray:
+    repl = {"#": CUBE, "O": ROUND, ".": EMPTY}
+    return np.array([[repl[elt] for elt in row] for row in grid], dtype=np.int8)
+
+
+def from_numpy(platform: np.ndarray):
+    repl = {CUBE: "#", ROUND: "O", EMPTY: "."}
+    return tuple("".join(repl[elt] for elt in row) for row in platform.tolist())
+
+
+def tilt_west(platform: np.ndarray) -> np.ndarray:
+    # fill each segment between cube rocks from its start with its round rocks
+    height, width = platform.shape
+    cubes = platform == CUBE
+    cols = np.arange(width)
+
+    # segment ids are unique over the whole platform: one row has at most
+    # width + 1 segments
+    segments = np.cumsum(cubes, axis=1) + (np.arange(height) * (width + 1))[:, None]
+    counts = np.bincount(
+        segments.ravel(),
+        weights=(platform == ROUND).ravel(),
+        minlength=height * (width + 1),
+    ).astype(np.int64)
+
+    segment_starts = np.maximum.accumulate(np.where(cubes, cols + 1, 0), axis=1)
+    is_round = ~cubes & (cols - segment_starts < counts[segments])
+    return np.where(cubes, CUBE, is_round).astype(np.int8)
+
+
+def tilt(platform: np.ndarray, direction: str) -> np.ndarray:
+    """Tilt towards "N", "W", "S" or "E", through views of `tilt_west`."""
+    match direction:
+        case "W":
+            return tilt_west(platform)
+        case "E":
+            return tilt_west(platform[:, ::-1])[:, ::-1]
+        case "N":
+            return tilt_west(platform.T).T
+        case "S":
+            return tilt_west(platform[::-1].T).T[::-1]
+        case _:
+            raise ValueError(f"Invalid direction: {direction}")
+
+
+def spin_cycle_numpy(platform: np.ndarray) -> np.ndarray:
+    for direction in "NWSE":
+        platform = tilt(platform, direction)
+    return platform
+
+
+def get_platform_weight(platform: np.ndarray) -> int:
+    height = platform.shape[0]
+    return int((platform == ROUND).sum(axis=1) @ np.arange(height, 0, -1))
 
 
 @lru_cache(CACHE_SIZE)
@@ -78,21 +133,37 @@ def to_str(grid):
     return "\n".join("".join(row) for row in grid)
 
 
-if __name__ == "__main__":
-    # print(get_weight("OO.O.O..##"))
-    # print(get_weight("O.#.O.O#O#"))
+def spin_cycle(grid):
+    """Tilt north, west, south then east: four tilt-and-rotate quarter turns."""
+    for _ in range(4):
+        grid = make_cycle(grid)
+    return grid
 
-    # print(resolve1())
 
-    weight = 0
-    grid = parse_input("input.txt")
-    for idx in range(4 * 1_000_000_000):
-        grid = make_cycle(grid)
-        if idx % 100_000_000 == 0:
-            print(idx)
+def spin(grid, cycle_count: int, cycle=spin_cycle, key=None):
+    # skip the remaining cycles once a state comes back; `key` hashes states
+    key = key or (lambda state: state)
+    seen = {key(grid): 0}
+    states = [grid]
+    for idx in range(1, cycle_count + 1):
+        grid = cycle(grid)
+        if (loop_start := seen.get(key(grid))) is not None:
+            period = idx - loop_start
+            return states[loop_start + (cycle_count - loop_start) % period]
+        seen[key(grid)] = idx
+        states.append(grid)
+    return grid
+
+
+def resolve2():
+    platform = to_numpy(parse_input("input.txt"))
+    platform = spin(platform, SPIN_CYCLE_COUNT, spin_cycle_numpy, np.ndarray.tobytes)
+    return get_platform_weight(platform)
 
-    print(to_str(grid))
-    print(get_grid_weight(grid))
+
+if __name__ == "__main__":
+    print(resolve1())
+    print(resolve2())
 
     #  O . # . O . O # . O
     # 10 9 8 7 6 5 4 3 2 1
@@ -1,6 +1,11 @@
+import sys
 from collections import defaultdict, deque
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from aoc.pool import map_chunks  # noqa: E402
+
 Grid = list[list[str]]
 Pos = tuple[int, int]
 Dir = int
@@ -94,24 +99,183 @@ def gprint(grid):
     print("\n".join("".join(row) for row in grid))
 
 
-def resolve1():
-    grid = parse_input("input.txt")
-    visited = follow(grid, (0, 0), 3)
-    return len(visited)
+DIR_VECTS = [(-1, 0), (0, -1), (1, 0), (0, 1)]  # up, left, down, right
 
+# outgoing directions of a beam entering a cell, by cell and incoming direction
+NEXT_DIRS: dict[str, tuple[tuple[Dir, ...], ...]] = {
+    ".": ((0,), (1,), (2,), (3,)),
+    "-": ((1, 3), (1,), (1, 3), (3,)),
+    "|": ((0,), (0, 2), (2,), (0, 2)),
+    "/": ((3,), (2,), (1,), (0,)),
+    "\\": ((1,), (0,), (3,), (2,)),
+}
 
-def resolve2():
-    grid = parse_input("input.txt")
 
+class BeamGraph:
+    """Beam propagation condensed once for all entry points."""
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.height, self.width = len(grid), len(grid[0])
+
+        # nodes: (mirror or splitter, incoming direction); each strongly
+        # connected component gets the int bitset of the cells it energizes
+        self.node_ids: dict[tuple[Pos, Dir], int] = {}
+        for x, row in enumerate(grid):
+            for y, char in enumerate(row):
+                if char != ".":
+                    for dir in range(4):
+                        self.node_ids[((x, y), dir)] = len(self.node_ids)
+
+        node_masks = [0] * len(self.node_ids)
+        successors: list[list[int]] = [[] for _ in self.node_ids]
+        for ((x, y), dir), node in self.node_ids.items():
+            mask = 1 << (x * self.width + y)
+            for next_dir in NEXT_DIRS[grid[x][y]][dir]:
+                dx, dy = DIR_VECTS[next_dir]
+                run_mask, next_node = self.trace((x + dx, y + dy), next_dir)
+                mask |= run_mask
+                if next_node is not None:
+                    successors[node].append(next_node)
+            node_masks[node] = mask
+
+        self.components, self.coverage = condense(node_masks, successors)
+
+    def trace(self, pos: Pos, dir: Dir) -> tuple[int, int | None]:
+        # cells lit up to the next mirror or splitter, and its node if any
+        grid, height, width = self.grid, self.height, self.width
+        dx, dy = DIR_VECTS[dir]
+        x, y = pos
+        mask = 0
+        while 0 <= x < height and 0 <= y < width:
+            mask |= 1 << (x * width + y)
+            if grid[x][y] != ".":
+                return mask, self.node_ids[((x, y), dir)]
+            x, y = x + dx, y + dy
+        return mask, None
+
+    def energized(self, pos: Pos, dir: Dir) -> int:
+        mask, node = self.trace(pos, dir)
+        if node is not None:
+            mask |= self.coverage[self.components[node]]
+        return mask.bit_count()
+
+
+def condense(
+    node_masks: list[int], successors: list[list[int]]
+) -> tuple[list[int], list[int]]:
+    """Iterative Tarjan: component of each node and mask of each component."""
+    # components close sinks first, so successors' coverage is always complete
+    index_counter = 0
+    indexes = [-1] * len(node_masks)
+    low_links = [0] * len(node_masks)
+    on_stack = [False] * len(node_masks)
+    stack: list[int] = []
+    components = [-1] * len(node_masks)
+    coverage: list[int] = []
+
+    for root in range(len(node_masks)):
+        if indexes[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, child_idx = work.pop()
+            if child_idx == 0:
+                indexes[node] = low_links[node] = index_counter
+                index_counter += 1
+                stack.append(node)
+                on_stack[node] = True
+
+            recurse = False
+            for idx in range(child_idx, len(successors[node])):
+                child = successors[node][idx]
+                if indexes[child] == -1:
+                    work.append((node, idx + 1))
+                    work.append((child, 0))
+                    recurse = True
+                    break
+                if on_stack[child]:
+                    low_links[node] = min(low_links[node], indexes[child])
+            if recurse:
+                continue
+
+            if low_links[node] == indexes[node]:
+                component = len(coverage)
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    components[member] = component
+                    members.append(member)
+                    if member == node:
+                        break
+
+                mask = 0
+                for member in members:
+                    mask |= node_masks[member]
+                    for child in successors[member]:
+                        if components[child] != component:
+                            mask |= coverage[components[child]]
+                coverage.append(mask)
+
+            if work:
+                parent = work[-1][0]
+                low_links[parent] = min(low_links[parent], low_links[node])
+
+    return components, coverage
+
+
+def get_start_states(grid: Grid) -> list[tuple[Pos, Dir]]:
     start_states = []
     start_states.extend(((0, col), 2) for col in range(len(grid[0])))
     start_states.extend(((row, len(grid[0]) - 1), 1) for row in range(len(grid)))
     start_states.extend(((len(grid) - 1, col), 0) for col in range(len(grid[0])))
     start_states.extend(((row, 0), 3) for row in range(len(grid)))
+    return start_states
+
 
+def read_grid(shm_name: str, height: int, width: int) -> Grid:
+    shm = SharedMemory(name=shm_name)
+    try:
+        data = bytes(shm.buf[: height * width])
+    finally:
+        shm.close()
+    return [list(data[x * width : (x + 1) * width].decode()) for x in range(height)]
+
+
+def max_energized(
+    grid_location: tuple[str, int, int], start_states: list[tuple[Pos, Dir]]
+) -> int:
+    grid = read_grid(*grid_location)
     return max(len(follow(grid, pos, dir)) for pos, dir in start_states)
 
 
+def max_energized_parallel(grid: Grid, workers: int | None = None) -> int:
+    """`resolve2` with `follow` over a process pool, the grid in shared memory."""
+    height, width = len(grid), len(grid[0])
+    shm = SharedMemory(create=True, size=height * width)
+    try:
+        shm.buf[: height * width] = "".join("".join(row) for row in grid).encode()
+        grid_location = (shm.name, height, width)
+        return max(
+            map_chunks(max_energized, grid_location, get_start_states(grid), workers)
+        )
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def resolve1():
+    grid = parse_input("input.txt")
+    return BeamGraph(grid).energized((0, 0), 3)
+
+
+def resolve2():
+    grid = parse_input("input.txt")
+    beam_graph = BeamGraph(grid)
+    return max(beam_graph.energized(pos, dir) for pos, dir in get_start_states(grid))
+
+
 if __name__ == "__main__":
     print(resolve1())
     print(resolve2())
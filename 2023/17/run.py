@@ -1,5 +1,6 @@
 from collections import defaultdict
 from dataclasses import dataclass
+from heapq import heappop, heappush
 from math import inf
 from pathlib import Path
 from queue import PriorityQueue
@@ -152,7 +153,6 @@ def to_mermaid(graph: Graph):
 
 
 def dijkstra(graph: Graph, start_node: Node, end_node: Node):
-    start_node = graph.get_node((0, 0), 0)
     weight_map: dict[Node:int] = {node: inf for node in graph.nodes.values()}
     weight_map[start_node] = 0
     q = PriorityQueue()
@@ -160,7 +160,7 @@ def dijkstra(graph: Graph, start_node: Node, end_node: Node):
     visited: set[Node] = set()
 
     while not q.empty():
-        (weight, node) = q.get()
+        weight, node = q.get()
         visited.add(node)
         for edge in graph.edges[node]:
             weight = edge.weight
@@ -174,20 +174,86 @@ def dijkstra(graph: Graph, start_node: Node, end_node: Node):
     return weight_map[end_node]
 
 
+def get_prefix_sums(grid: Grid) -> tuple[list[list[int]], list[list[int]]]:
+    # row_sums[x][y]: heat loss of grid[x][:y], col_sums[y][x]: above row x
+    row_sums = []
+    for row in grid:
+        sums = [0]
+        for value in row:
+            sums.append(sums[-1] + value)
+        row_sums.append(sums)
+
+    col_sums = []
+    for col in zip(*grid):
+        sums = [0]
+        for value in col:
+            sums.append(sums[-1] + value)
+        col_sums.append(sums)
+    return row_sums, col_sums
+
+
+def crucible_path(grid: Grid, min_dist=1, max_dist=3, use_heuristic=True) -> int:
+    """Lazy Dijkstra (A* if `use_heuristic`) over the graph of `build_graph`."""
+    # state: (x * width + y) * 2 + plane of the next move
+    height, width = len(grid), len(grid[0])
+    row_sums, col_sums = get_prefix_sums(grid)
+    end_x, end_y = height - 1, width - 1
+
+    def heuristic(x: int, y: int) -> int:
+        # every cell costs at least 1, so this never overestimates
+        return (end_x - x) + (end_y - y) if use_heuristic else 0
+
+    dist = [inf] * (height * width * 2)
+    heap = []
+    for plane in (Plane.HORIZONTAL, Plane.VERTICAL):
+        dist[plane] = 0
+        heappush(heap, (heuristic(0, 0), 0, plane))
+
+    while heap:
+        _, cost, state = heappop(heap)
+        if cost > dist[state]:
+            # stale entry, a cheaper path to this state was already found
+            continue
+
+        pos_index, plane = divmod(state, 2)
+        x, y = divmod(pos_index, width)
+        if x == end_x and y == end_y:
+            return cost
+
+        next_plane = 1 - plane
+        for pace in (1, -1):
+            for step in range(min_dist, max_dist + 1):
+                if plane == Plane.VERTICAL:
+                    dest_x, dest_y = x + pace * step, y
+                    if not 0 <= dest_x < height:
+                        break
+                    sums = col_sums[y]
+                    lo, hi = (x + 1, dest_x + 1) if pace > 0 else (dest_x, x)
+                else:
+                    dest_x, dest_y = x, y + pace * step
+                    if not 0 <= dest_y < width:
+                        break
+                    sums = row_sums[x]
+                    lo, hi = (y + 1, dest_y + 1) if pace > 0 else (dest_y, y)
+
+                new_cost = cost + sums[hi] - sums[lo]
+                dest_state = (dest_x * width + dest_y) * 2 + next_plane
+                if new_cost < dist[dest_state]:
+                    dist[dest_state] = new_cost
+                    priority = new_cost + heuristic(dest_x, dest_y)
+                    heappush(heap, (priority, new_cost, dest_state))
+
+    return inf
+
+
 def resolve1():
     grid = parse_input("input.txt")
-    graph = build_graph(grid)
-    start_node = graph.get_node((0, 0), 0)
-    end_node = graph.get_node((len(grid) - 1, len(grid[0]) - 1), 0)
-    return dijkstra(graph, start_node, end_node)
+    return crucible_path(grid)
 
 
 def resolve2():
     grid = parse_input("input.txt")
-    graph = build_graph(grid, 4, 10)
-    start_node = graph.get_node((0, 0), 0)
-    end_node = graph.get_node((len(grid) - 1, len(grid[0]) - 1), 0)
-    return dijkstra(graph, start_node, end_node)
+    return crucible_path(grid, 4, 10)
 
 
 if __name__ == "__main__":
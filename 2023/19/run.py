@@ -6,6 +6,8 @@ from math import inf
 from pathlib import Path
 from queue import Queue
 
+import numpy as np
+
 LETTERS = "xmas"
 
 
@@ -87,14 +89,94 @@ def process(workflows: dict[str, Workflow], input: dict[str, int]) -> bool:
     return label == "A"
 
 
+ACCEPT, REJECT = -1, -2
+
+
+@dataclass
+class DecisionTree:
+    """Workflows flattened into one integer decision tree."""
+
+    # node i sends a part to lower[i] if part[letters[i]] < values[i], else
+    # to upper[i]; negative ids are the ACCEPT and REJECT leaves
+    letters: list[int]
+    values: list[int]
+    lower: list[int]
+    upper: list[int]
+    root: int
+
+    @staticmethod
+    def compile(workflows: dict[str, Workflow]) -> "DecisionTree":
+        tree = DecisionTree([], [], [], [], REJECT)
+        workflow_roots: dict[str, int] = {"A": ACCEPT, "R": REJECT}
+
+        def compile_rules(rules: list[Rule]) -> int:
+            rule, *next_rules = rules
+            if rule.operator == "default":
+                return compile_label(rule.target)
+
+            node = len(tree.letters)
+            tree.letters.append(LETTERS.index(rule.letter))
+            tree.values.append(rule.value)
+            tree.lower.append(REJECT)
+            tree.upper.append(REJECT)
+
+            matched = compile_label(rule.target)
+            unmatched = compile_rules(next_rules)
+            # "x > v" is "not x < v + 1": every node only tests "<"
+            if rule.operator == "<":
+                tree.lower[node], tree.upper[node] = matched, unmatched
+            else:
+                tree.values[node] = rule.value + 1
+                tree.lower[node], tree.upper[node] = unmatched, matched
+            return node
+
+        def compile_label(label: str) -> int:
+            if label not in workflow_roots:
+                workflow_roots[label] = compile_rules(workflows[label].rules)
+            return workflow_roots[label]
+
+        tree.root = compile_label("in")
+        return tree
+
+    def is_accepted(self, part: tuple[int, ...]) -> bool:
+        letters, values, lower, upper = (
+            self.letters,
+            self.values,
+            self.lower,
+            self.upper,
+        )
+        node = self.root
+        while node >= 0:
+            node = lower[node] if part[letters[node]] < values[node] else upper[node]
+        return node == ACCEPT
+
+    def accepted_mask(self, parts: np.ndarray) -> np.ndarray:
+        """Classify a `(n, len(LETTERS))` array of parts at once."""
+        letters, values = np.array(self.letters), np.array(self.values)
+        lower, upper = np.array(self.lower), np.array(self.upper)
+
+        nodes = np.full(len(parts), self.root)
+        active = np.flatnonzero(nodes >= 0)
+        while active.size:
+            current = nodes[active]
+            ratings = parts[active, letters[current]]
+            nodes[active] = np.where(
+                ratings < values[current], lower[current], upper[current]
+            )
+            active = active[nodes[active] >= 0]
+        return nodes == ACCEPT
+
+
+def to_tuple(part: dict[str, int]) -> tuple[int, ...]:
+    return tuple(part[letter] for letter in LETTERS)
+
+
 def resolve1():
     workflows, part_inputs = parse_input("input.txt")
+    tree = DecisionTree.compile(workflows)
 
-    return sum(
-        sum(part_input.values())
-        for part_input in part_inputs
-        if process(workflows, part_input)
-    )
+    parts = [to_tuple(part_input) for part_input in part_inputs]
+    return sum(sum(part) for part in parts if tree.is_accepted(part))
 
 
 class Interval:
@@ -193,19 +275,41 @@ def split_intervals(workflows: dict[str, Workflow]):
     return valid_intervales
 
 
-if __name__ == "__main__":
-    # print(resolve2())
-
+Box = tuple[int, ...]  # lo_0, hi_0, lo_1, hi_1, ... with half-open [lo, hi)
+
+
+def accepted_volume(tree: DecisionTree, box: Box) -> int:
+    """Number of rating combinations in `box` accepted by `tree`."""
+    letters, values, lower, upper = tree.letters, tree.values, tree.lower, tree.upper
+    res = 0
+    stack = [(box, tree.root)]
+    while stack:
+        box, node = stack.pop()
+        if node < 0:
+            if node == ACCEPT:
+                volume = 1
+                for idx in range(0, len(box), 2):
+                    volume *= box[idx + 1] - box[idx]
+                res += volume
+            continue
+
+        dim = 2 * letters[node]
+        lo, hi, value = box[dim], box[dim + 1], values[node]
+        if lo < value:
+            lower_box = box[: dim + 1] + (min(hi, value),) + box[dim + 2 :]
+            stack.append((lower_box, lower[node]))
+        if value < hi:
+            upper_box = box[:dim] + (max(lo, value),) + box[dim + 1 :]
+            stack.append((upper_box, upper[node]))
+    return res
+
+
+def resolve2():
     workflows, _ = parse_input("input.txt")
-    intervals = split_intervals(workflows)
-    from pprint import pprint
+    tree = DecisionTree.compile(workflows)
+    return accepted_volume(tree, (1, 4001) * len(LETTERS))
 
-    pprint(intervals)
-    res = sum(interval.content_sum for interval in intervals)
-    print(res)
 
-    # interval = MetaInterval()
-    # interval, _ = interval.split(7, "s")
-
-    # _, interval = interval.split(8, "s")
-    # print(bool(interval))
+if __name__ == "__main__":
+    print(resolve1())
+    print(resolve2())
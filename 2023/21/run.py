@@ -1,11 +1,14 @@
-import json
+from array import array
+from collections import deque
 from collections.abc import Generator
 from copy import deepcopy
-from dataclasses import dataclass
 from itertools import chain
 from pathlib import Path
 
-JSON_MAP_PATH = "touch_map.json"
+import numpy as np
+
+TOUCH_MAP_PATH = "touch_map.npy"
+INFINITE_STEP_COUNT = 26501365
 
 Grid = list[list[str]]
 Pos = tuple[int, int]
@@ -52,11 +55,52 @@ def get_start_pos(grid):
                 return (x, y)
 
 
+def get_distances(grid: Grid, start_pos: Pos) -> array:
+    """Flat row-major BFS distances from `start_pos`, -1 if unreachable."""
+    height, width = len(grid), len(grid[0])
+    distances = array("i", [-1]) * (height * width)
+    start = start_pos[0] * width + start_pos[1]
+    distances[start] = 0
+
+    queue = deque([start])
+    while queue:
+        idx = queue.popleft()
+        x, y = divmod(idx, width)
+        next_distance = distances[idx] + 1
+        for _x, _y in ((x, y + 1), (x + 1, y), (x, y - 1), (x - 1, y)):
+            if 0 <= _x < height and 0 <= _y < width and grid[_x][_y] != "#":
+                _idx = _x * width + _y
+                if distances[_idx] == -1:
+                    distances[_idx] = next_distance
+                    queue.append(_idx)
+    return distances
+
+
+def get_reach_counts(distances: array) -> list[int]:
+    # reach_counts[n]: plots at a distance <= n with the parity of n
+    max_distance = max(distances)
+    histogram = [0] * (max_distance + 2)
+    for distance in distances:
+        if distance >= 0:
+            histogram[distance] += 1
+
+    reach_counts = histogram[:]
+    for n in range(2, len(reach_counts)):
+        reach_counts[n] += reach_counts[n - 2]
+    return reach_counts
+
+
+def count_reachable(reach_counts: list[int], n: int) -> int:
+    if n >= len(reach_counts):
+        # no new plot past the farthest one, only the parity matters
+        n = len(reach_counts) - 1 - (len(reach_counts) - 1 - n) % 2
+    return reach_counts[n]
+
+
 def resolve1():
     grid = parse_input("input.txt")
-    pos_list = {get_start_pos(grid)}
-    pos_list = incr_n(grid, get_start_pos(grid), 64)
-    return len(pos_list)
+    reach_counts = get_reach_counts(get_distances(grid, get_start_pos(grid)))
+    return count_reachable(reach_counts, 64)
 
 
 def get_border_pos(grid: Grid) -> Generator[Pos]:
@@ -82,28 +126,31 @@ def get_touch_counts(grid: Grid, init_pos: Pos) -> dict[Pos, int]:
     return touches
 
 
-def tuple_to_str(_map: dict[Pos, dict[Pos, int]]):
-    def conv(t):
-        return "_".join(str(e) for e in t)
-
-    return {
-        conv(base_pos): {conv(k): v for k, v in touches.items()}
-        for base_pos, touches in _map.items()
-    }
+def get_border_list(grid: Grid) -> list[Pos]:
+    # without duplicated corners: the row and column order of the touch map
+    return list(dict.fromkeys(get_border_pos(grid)))
 
 
 def build_touch_map(grid: Grid):
-    touch_map: dict[Pos, dict[Pos, int]] = {}
-    for border_pos in get_border_pos(grid):
-        touch_map[border_pos] = get_touch_counts(grid, border_pos)
-
-    p = Path(__file__).resolve().parent / JSON_MAP_PATH
-    p.write_text(json.dumps(tuple_to_str(touch_map)))
+    # border to border distances (-1 if unreachable), in get_border_list order
+    border = get_border_list(grid)
+    width = len(grid[0])
+    border_indexes = [x * width + y for x, y in border]
+
+    touch_map = np.empty((len(border), len(border)), dtype=np.int32)
+    for row, border_pos in enumerate(border):
+        distances = get_distances(grid, border_pos)
+        touch_map[row] = [distances[idx] for idx in border_indexes]
+
+    p = Path(__file__).resolve().parent / TOUCH_MAP_PATH
+    np.save(p, touch_map)
     print("Map saved!")
 
 
-def build_sector_map(grid: Grid):
-    pass
+def load_touch_map() -> np.ndarray:
+    # memory-mapped: read lazily, pages shared between processes
+    p = Path(__file__).resolve().parent / TOUCH_MAP_PATH
+    return np.load(p, mmap_mode="r")
 
 
 def color(grid: Grid, positions: set[Pos]) -> str:
@@ -122,29 +169,68 @@ def save(grid: Grid, path: str = "draw.txt"):
     p.write_text(to_str(grid))
 
 
-class Sector:
-    pos: Pos
-    intrusions: dict[Pos, int]
-
+def sum_tiles(
+    reach_counts: list[int], first_steps: int, tile_size: int, weighted: bool
+) -> int:
+    """Reachable plots over a line of tiles, the t-th one weighted by t + 1 if
+    `weighted`."""
+    # saturated tiles alternate with the parity of t (odd tile size): closed form
+    if first_steps < 0:
+        return 0
+    last = first_steps // tile_size
+    # count_reachable saturates past the largest distance of the tile
+    saturated_last = min(last, (first_steps - len(reach_counts)) // tile_size)
+
+    res = 0
+    for parity in (0, 1):
+        start, end = parity, saturated_last - (saturated_last - parity) % 2
+        if end < start:
+            continue
+        term_count = (end - start) // 2 + 1
+        weight = term_count
+        if weighted:
+            weight += term_count * (start + end) // 2
+        res += weight * count_reachable(reach_counts, first_steps - start * tile_size)
+
+    for t in range(max(saturated_last + 1, 0), last + 1):
+        count = count_reachable(reach_counts, first_steps - t * tile_size)
+        res += (t + 1 if weighted else 1) * count
+    return res
 
-def get_mega_pos_count(grid: Grid) -> int:
-    get_start_pos = get_start_pos(grid)
 
-    s0 = Sector((0, 0), 0)
-    sectors: dict[Pos, Sector] = {(0, 0)}
+def count_infinite_reachable(grid: Grid, steps: int) -> int:
+    """Plots reachable in exactly `steps` steps on the infinitely tiled garden."""
+    # with a clear border, row and column of S, other tiles are entered at an
+    # edge middle or a corner: 9 classes of tiles, one BFS each
+    size = len(grid)
+    half = size // 2
+    if size % 2 != 1 or len(grid[0]) != size or get_start_pos(grid) != (half, half):
+        raise ValueError("S should be at the center of an odd-sized square grid")
+    if any(
+        grid[x][y] == "#"
+        for x, y in chain(get_border_pos(grid), ((half, i) for i in range(size)))
+    ) or any(grid[i][half] == "#" for i in range(size)):
+        raise ValueError("The border and the row and column of S should be clear")
+
+    def reach_from(pos: Pos) -> list[int]:
+        return get_reach_counts(get_distances(grid, pos))
+
+    res = count_reachable(reach_from((half, half)), steps)
+    edge_entries = [(0, half), (size - 1, half), (half, 0), (half, size - 1)]
+    for entry in edge_entries:
+        res += sum_tiles(reach_from(entry), steps - (half + 1), size, False)
+
+    corner_entries = [(0, 0), (0, size - 1), (size - 1, 0), (size - 1, size - 1)]
+    for entry in corner_entries:
+        res += sum_tiles(reach_from(entry), steps - 2 * (half + 1), size, True)
+    return res
 
 
-if __name__ == "__main__":
+def resolve2():
     grid = parse_input("input.txt")
-    start_pos = get_start_pos(grid)
+    return count_infinite_reachable(grid, INFINITE_STEP_COUNT)
 
-    print(len(grid), len(grid[0]))
-    print(start_pos)
-    # touches = get_touch_counts(grid, start_pos)
 
-    # first_touch = min(touches, key=lambda x: touches[x])
-
-    # positions = incr_n(grid, start_pos, touches[first_touch])
-    # res = color(grid, positions)
-    # save(res)
-    # print("drawing saved!")
+if __name__ == "__main__":
+    print(resolve1())
+    print(resolve2())
@@ -1,5 +1,10 @@
+import sys
+from bisect import bisect_left
 from pathlib import Path
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from aoc.pool import map_chunks  # noqa: E402
+
 
 def parse_input(path: str):
     p = Path(__file__).resolve().parent / path
@@ -58,22 +63,115 @@ def move(pos: Position, grid: Grid, dir: Direction) -> tuple[list[Position], boo
         visited.append((x, y))
 
 
-def resolve1():
-    grid = Grid(parse_input("input.txt"))
-    pos = grid.get_first_pos()
-    direction_index = 0
+class ObstacleIndex:
+    """Sorted obstacle rows of every column and columns of every row."""
+
+    def __init__(self, grid: list[str]) -> None:
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.row_walls: list[list[int]] = [[] for _ in range(self.height)]
+        self.col_walls: list[list[int]] = [[] for _ in range(self.width)]
+        for x, line in enumerate(grid):
+            for y, char in enumerate(line):
+                if char == "#":
+                    self.row_walls[x].append(y)
+                    self.col_walls[y].append(x)
+                elif char == "^":
+                    self.start_pos = (x, y)
+
+    def next_wall(
+        self, pos: Position, direction_index: int, extra_wall_pos: Position | None
+    ) -> Position | None:
+        """First obstacle met walking from `pos`, None if the guard leaves."""
+        x, y = pos
+        vertical = direction_index % 2 == 0
+        if vertical:
+            walls, coord = self.col_walls[y], x
+            extra = (
+                extra_wall_pos[0] if extra_wall_pos and extra_wall_pos[1] == y else None
+            )
+        else:
+            walls, coord = self.row_walls[x], y
+            extra = (
+                extra_wall_pos[1] if extra_wall_pos and extra_wall_pos[0] == x else None
+            )
+
+        idx = bisect_left(walls, coord)
+        if direction_index in (1, 2):
+            # right or down, towards increasing coordinates
+            wall = walls[idx] if idx < len(walls) else None
+            if extra is not None and coord < extra and (wall is None or extra < wall):
+                wall = extra
+        else:
+            wall = walls[idx - 1] if idx > 0 else None
+            if extra is not None and extra < coord and (wall is None or wall < extra):
+                wall = extra
+
+        if wall is None:
+            return None
+        return (wall, y) if vertical else (x, wall)
+
+    def walk(
+        self,
+        pos: Position,
+        direction_index: int = 0,
+        extra_wall_pos: Position | None = None,
+    ):
+        # (pos, direction_index, wall) per straight run, wall None off the grid
+        while True:
+            wall = self.next_wall(pos, direction_index, extra_wall_pos)
+            yield pos, direction_index, wall
+            if wall is None:
+                return
+            dx, dy = DIRECTIONS[direction_index]
+            pos = (wall[0] - dx, wall[1] - dy)
+            direction_index = (direction_index + 1) % 4
+
+    def run_end(self, pos: Position, direction_index: int, wall: Position | None):
+        """Last cell of a straight run of `walk`."""
+        if wall is not None:
+            dx, dy = DIRECTIONS[direction_index]
+            return (wall[0] - dx, wall[1] - dy)
+        match direction_index:
+            case 0:
+                return (0, pos[1])
+            case 1:
+                return (pos[0], self.width - 1)
+            case 2:
+                return (self.height - 1, pos[1])
+            case _:
+                return (pos[0], 0)
+
+    def has_loop(
+        self,
+        pos: Position,
+        direction_index: int = 0,
+        extra_wall_pos: Position | None = None,
+    ) -> bool:
+        # hitting the same obstacle from the same side twice is a loop
+        turns: set[tuple[Position, int]] = set()
+        for _, _direction_index, wall in self.walk(
+            pos, direction_index, extra_wall_pos
+        ):
+            if wall is None:
+                return False
+            if (wall, _direction_index) in turns:
+                return True
+            turns.add((wall, _direction_index))
 
-    visited: set[Position] = set()
-    while True:
-        _visited, is_end = move(pos, grid, DIRECTIONS[direction_index])
-        visited.update(_visited)
-        if is_end:
-            break
 
-        if _visited:
-            pos = _visited[-1]
+def resolve1():
+    index = ObstacleIndex(parse_input("input.txt"))
 
-        direction_index = (direction_index + 1) % 4
+    visited: set[Position] = set()
+    for pos, direction_index, wall in index.walk(index.start_pos):
+        end = index.run_end(pos, direction_index, wall)
+        dx, dy = DIRECTIONS[direction_index]
+        x, y = pos
+        visited.add(pos)
+        while (x, y) != end:
+            x, y = x + dx, y + dy
+            visited.add((x, y))
 
     return len(visited)
 
@@ -102,19 +200,38 @@ def has_loop(grid: Grid) -> bool:
             state_hashes.add(state_hash)
 
 
-def resolve2():
+def get_candidates(index: ObstacleIndex) -> list[tuple[Position, Position, int]]:
+    # only cells of the original path, each with the guard state before it
+    candidates = []
+    seen = {index.start_pos}
+    for pos, direction_index, wall in index.walk(index.start_pos):
+        end = index.run_end(pos, direction_index, wall)
+        dx, dy = DIRECTIONS[direction_index]
+        while pos != end:
+            next_pos = (pos[0] + dx, pos[1] + dy)
+            if next_pos not in seen:
+                seen.add(next_pos)
+                candidates.append((next_pos, pos, direction_index))
+            pos = next_pos
+    return candidates
+
 
-    _grid = parse_input("input.txt")
-    n = len(_grid)
-    print(n)
-    res = 0
-    for x in range(n):
-        for y in range(n):
-            print(x, y)
-            if _grid[x][y] == ".":
-                grid = Grid(_grid, (x, y))
-                res += 1 if has_loop(grid) else 0
-    return res
+def count_loops(
+    index: ObstacleIndex, candidates: list[tuple[Position, Position, int]]
+) -> int:
+    return sum(
+        index.has_loop(pos, direction_index, extra_wall_pos)
+        for extra_wall_pos, pos, direction_index in candidates
+    )
+
+
+def count_loop_positions(index: ObstacleIndex, workers: int | None = None) -> int:
+    return sum(map_chunks(count_loops, index, get_candidates(index), workers))
+
+
+def resolve2():
+    index = ObstacleIndex(parse_input("input.txt"))
+    return count_loop_positions(index)
 
 
 if __name__ == "__main__":
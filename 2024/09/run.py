@@ -1,5 +1,5 @@
+import heapq
 from pathlib import Path
-from uuid import uuid4
 
 
 def parse_input(path: str) -> str:
@@ -52,30 +52,61 @@ def display(array):
     print("".join(("." if elt == -1 else str(elt)) for elt in array))
 
 
+def compact_blocks(line: str) -> int:
+    # solve_p1 checksum on the run-length map: each placed run is a series
+    sizes = [int(char) for char in line]
+    checksum = 0
+    position = 0
+
+    right_file = (len(sizes) - 1) // 2
+    right_remaining = sizes[2 * right_file]
+
+    for idx, size in enumerate(sizes):
+        current_file = idx // 2
+        if current_file >= right_file:
+            # what is left of the last moved file stays in place
+            if current_file == right_file and idx % 2 == 0:
+                checksum += span_checksum(right_file, position, right_remaining)
+            break
+
+        if idx % 2 == 0:
+            checksum += span_checksum(current_file, position, size)
+            position += size
+            continue
+
+        while size > 0 and right_file > current_file:
+            moved = min(size, right_remaining)
+            checksum += span_checksum(right_file, position, moved)
+            position += moved
+            size -= moved
+            right_remaining -= moved
+            if right_remaining == 0:
+                right_file -= 1
+                right_remaining = sizes[2 * right_file]
+
+    return checksum
+
+
 def resolve1():
     line = parse_input("input.txt")
-    array = to_array(line)
-    solved = solve_p1(array)
-    # display(solved)
-    return sum(i * v for i, v in enumerate(solved) if v != -1)
+    return compact_blocks(line)
 
 
 class Block:
     size: int
-    _uuid: uuid4
     id: int | None = None
 
     def __init__(self, size: int, id: int | None = None):
         self.size = size
         self.id = id
-        self._uuid = uuid4()
 
     @property
     def is_empty(self):
         return self.id is None
 
     def __hash__(self):
-        return hash(self._uuid)
+        # identity, two blocks can hold the same file id and size
+        return id(self)
 
     def __repr__(self):
         return f"({'X' if self.is_empty else self.id }, {self.size})"
@@ -205,6 +236,64 @@ def _resolve2(path: str):
     return get_checksum(blocks)
 
 
+def span_checksum(file_id: int, start: int, size: int) -> int:
+    # file_id * (start + (start + 1) + ... + (start + size - 1))
+    return file_id * (size * start + size * (size - 1) // 2)
+
+
+def compact_files(line: str) -> int:
+    # gaps[size]: min-heap of the starts of the gaps of that size
+    files = []  # (start, size) by file id
+    gap_list = []  # (start, size)
+    position = 0
+    for idx, size in enumerate(map(int, line)):
+        if idx % 2 == 0:
+            files.append((position, size))
+        elif size > 0:
+            if gap_list and sum(gap_list[-1]) == position:
+                # only an empty file separates the two gaps
+                gap_list[-1] = (gap_list[-1][0], gap_list[-1][1] + size)
+            else:
+                gap_list.append((position, size))
+        position += size
+
+    max_gap_size = max((size for _, size in gap_list), default=0)
+    gaps: list[list[int]] = [[] for _ in range(max(max_gap_size, 9) + 1)]
+    for start, size in gap_list:
+        gaps[size].append(start)
+    for heap in gaps:
+        heapq.heapify(heap)
+
+    checksum = 0
+    for file_id in range(len(files) - 1, -1, -1):
+        start, size = files[file_id]
+
+        best_size = None
+        for gap_size in range(size, len(gaps)):
+            heap = gaps[gap_size]
+            if (
+                heap
+                and heap[0] < start
+                and (best_size is None or heap[0] < gaps[best_size][0])
+            ):
+                best_size = gap_size
+
+        if best_size is not None:
+            gap_start = heapq.heappop(gaps[best_size])
+            if best_size > size:
+                heapq.heappush(gaps[best_size - size], gap_start + size)
+            start = gap_start
+            # the space freed on the right is never used: every file left to
+            # move lies before it
+
+        checksum += span_checksum(file_id, start, size)
+    return checksum
+
+
+def repr_checksum(flat: str) -> int:
+    return sum(idx * int(char) for idx, char in enumerate(flat) if char != ".")
+
+
 def test() -> None:
     p = Path(__file__).resolve().parent / "test_cases.txt"
 
@@ -225,11 +314,20 @@ def test() -> None:
         output_repr = flat_repr(blocks)
         assert output_repr == exp_output, f"{output_repr} != {exp_output}"
 
+        checksum = compact_files(_input)
+        assert checksum == repr_checksum(exp_output), checksum
+
+        array = solve_p1(to_array(_input))
+        exp_checksum = sum(idx * elt for idx, elt in enumerate(array) if elt != -1)
+        checksum = compact_blocks(_input)
+        assert checksum == exp_checksum, f"{checksum} != {exp_checksum}"
+
 
 def resolve2():
-    test()
-    return _resolve2("input.txt")
+    line = parse_input("input.txt")
+    return compact_files(line)
 
 
 if __name__ == "__main__":
+    test()
     print(resolve2())
@@ -1,12 +1,10 @@
+import sys
 from pathlib import Path
 from collections import defaultdict
 from functools import lru_cache
 
-Pos = tuple[int, int]
-
-Grid = tuple[tuple[int, ...], ...]
-
-DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from aoc.grid import Grid  # noqa: E402
 
 
 def parse_input(path: str):
@@ -15,63 +13,40 @@ def parse_input(path: str):
     content = p.read_text()
     if content.endswith("\n"):
         content = content[:-1]
-    return tuple(tuple(int(elt) for elt in line) for line in content.split("\n"))
-
-
-def is_valid_pos(grid: Grid, pos: Pos):
-    return 0 <= pos[0] < len(grid) and 0 <= pos[1] < len(grid[0])
+    return Grid.from_rows([[int(elt) for elt in line] for line in content.split("\n")])
 
 
+# cells are flat indexes of the grid: the sentinel border never matches value + 1
 @lru_cache
-def get_reachable_nines(grid: Grid, pos: Pos) -> tuple[Pos, ...]:
-    x, y = pos
-    value = grid[x][y]
+def get_reachable_nines(grid: Grid, index: int) -> frozenset[int]:
+    value = grid[index]
     if value == 9:
-        return tuple({pos})
-    res = tuple()
-    for dx, dy in DIRECTIONS:
-        tx, ty = (x + dx, y + dy)
-        if is_valid_pos(grid, (tx, ty)) and grid[tx][ty] == (value + 1):
-            res = merge_tuples(res, get_reachable_nines(grid, (tx, ty)))
+        return frozenset({index})
+    res = frozenset()
+    for offset in grid.offsets:
+        if grid[index + offset] == value + 1:
+            res |= get_reachable_nines(grid, index + offset)
     return res
 
 
 @lru_cache
-def get_distinct_trail_count(grid: Grid, pos: Pos) -> int:
-    x, y = pos
-    value = grid[x][y]
+def get_distinct_trail_count(grid: Grid, index: int) -> int:
+    value = grid[index]
     if value == 9:
         return 1
     res = 0
-    for dx, dy in DIRECTIONS:
-        tx, ty = (x + dx, y + dy)
-        if is_valid_pos(grid, (tx, ty)) and grid[tx][ty] == (value + 1):
-            res += get_distinct_trail_count(grid, (tx, ty))
+    for offset in grid.offsets:
+        if grid[index + offset] == value + 1:
+            res += get_distinct_trail_count(grid, index + offset)
     return res
 
 
-def merge_tuples(t1: tuple[Pos, ...], t2: tuple[Pos, ...]) -> tuple[Pos, ...]:
-    return set(set(t1) | set(t2))
-
-
 def get_map_score(grid: Grid):
-    n = len(grid)
-    return sum(
-        len(get_reachable_nines(grid, (x, y)))
-        for x in range(n)
-        for y in range(n)
-        if grid[x][y] == 0
-    )
+    return sum(len(get_reachable_nines(grid, index)) for index in grid.find_all(0))
 
 
 def get_map_rating(grid: Grid):
-    n = len(grid)
-    return sum(
-        get_distinct_trail_count(grid, (x, y))
-        for x in range(n)
-        for y in range(n)
-        if grid[x][y] == 0
-    )
+    return sum(get_distinct_trail_count(grid, index) for index in grid.find_all(0))
 
 
 def test():
@@ -1,5 +1,6 @@
+from collections import Counter
 from pathlib import Path
-from functools import lru_cache, cache
+from functools import cache
 
 
 def parse_input(path: str) -> list[int]:
@@ -11,8 +12,12 @@ def parse_input(path: str) -> list[int]:
     return [int(elt) for elt in content.split(" ")]
 
 
-def count_digits(number: int) -> str:
-    return len(str(number))
+def count_digits(number: int) -> int:
+    digits, power = 1, 10
+    while number >= power:
+        power *= 10
+        digits += 1
+    return digits
 
 
 def process_line(line: list[int]):
@@ -25,7 +30,7 @@ def process_line(line: list[int]):
     return next_line
 
 
-@lru_cache
+@cache
 def process_number(n: int) -> tuple[int, int | None]:
     if n == 0:
         return (1, None)
@@ -52,25 +57,28 @@ def rec(n: int, counter: int) -> int:
         return sum(rec(elt, counter - 1) for elt in res)
 
 
-def resolve1():
+def blink(stones: Counter[int], count: int) -> Counter[int]:
+    """Evolve the stones `count` times, keeping one entry per distinct value
+    along with how many stones carry it."""
+    for _ in range(count):
+        next_stones = Counter()
+        for n, n_count in stones.items():
+            n1, n2 = process_number(n)
+            next_stones[n1] += n_count
+            if n2 is not None:
+                next_stones[n2] += n_count
+        stones = next_stones
+    return stones
 
-    line = parse_input("input.txt")
-    count = 25
-    res = 0
-    for i_elt, elt in enumerate(line):
-        res += rec(elt, count - 1)
 
-    return res
+def resolve1():
+    line = parse_input("input.txt")
+    return blink(Counter(line), 25).total()
 
 
 def resolve2():
     line = parse_input("input.txt")
-    count = 75
-    res = 0
-    for i_elt, elt in enumerate(line):
-        res += rec(elt, count - 1)
-
-    return res
+    return blink(Counter(line), 75).total()
 
 
 if __name__ == "__main__":
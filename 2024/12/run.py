@@ -1,3 +1,4 @@
+import sys
 from pathlib import Path
 from enum import Enum
 from copy import deepcopy
@@ -5,6 +6,9 @@ from operator import or_
 from functools import reduce
 from collections import defaultdict
 
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from aoc.bitset import PosSet  # noqa: E402
+
 Pos = tuple[int, int]
 
 DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
@@ -19,10 +23,10 @@ def parse_input(path: str) -> list[str]:
     return content.split("\n")
 
 
-def get_group(grid: list[str], pos: Pos) -> tuple[set[Pos], int]:
+def get_group(grid: list[str], pos: Pos) -> tuple[PosSet, int]:
     x, y = pos
     value = grid[x][y]
-    seen: set[Pos] = set()
+    seen = PosSet(len(grid), len(grid[0]))
     to_visit: set[Pos] = {pos}
     edges: set[Edge] = set()
     while to_visit:
@@ -220,7 +224,7 @@ def is_valid_pos(grid: list[str], pos: Pos) -> bool:
 
 def resolve1():
     grid = parse_input("input.txt")
-    seen: set[Pos] = set()
+    seen = PosSet(len(grid), len(grid[0]))
     res = 0
     for x in range(len(grid)):
         for y in range(len(grid)):
@@ -233,7 +237,7 @@ def resolve1():
 
 def resolve2():
     grid = parse_input("input.txt")
-    seen: set[Pos] = set()
+    seen = PosSet(len(grid), len(grid[0]))
     res = 0
     for x in range(len(grid)):
         for y in range(len(grid)):
@@ -0,0 +1,221 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import statistics
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+
+from aoc import parse_cache as parse_cache_module
+from aoc.runner import ROOT, EntryPoint, discover, load_module
+
+DEFAULT_YEARS = ["2023", "2024"]
+DEFAULT_OUTPUT = ROOT / "bench_results.json"
+
+
+@dataclass
+class BenchResult:
+    label: str
+    samples: list[float]
+    error: str | None = None
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def iqr(self) -> float:
+        if len(self.samples) < 2:
+            return 0.0
+        q1, _, q3 = statistics.quantiles(self.samples, n=4)
+        return q3 - q1
+
+    def to_dict(self) -> dict:
+        # failed results are never saved
+        data = {key: value for key, value in asdict(self).items() if key != "error"}
+        return {**data, "median": self.median, "iqr": self.iqr}
+
+
+@dataclass
+class Comparison:
+    label: str
+    baseline: float  # median
+    current: float  # median
+    p_value: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else math.inf
+
+
+def clear_caches(module: ModuleType):
+    # functools caches would turn every sample after the first one into a lookup
+    for value in vars(module).values():
+        if callable(cache_clear := getattr(value, "cache_clear", None)):
+            cache_clear()
+
+
+def bench_entry_point(
+    entry_point: EntryPoint, warmup: int, samples: int, parse_cache=False
+):
+    os.chdir(ROOT)
+    timings = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_module(entry_point.path)
+            if parse_cache:
+                parse_cache_module.install(module)
+            func = getattr(module, entry_point.name)
+
+            for idx in range(warmup + samples):
+                clear_caches(module)
+                start = time.perf_counter()
+                func()
+                duration = time.perf_counter() - start
+                if idx >= warmup:
+                    timings.append(duration)
+    except Exception:
+        error = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+        return BenchResult(entry_point.label, timings, error)
+
+    return BenchResult(entry_point.label, timings)
+
+
+def mann_whitney_p_value(a: list[float], b: list[float]) -> float:
+    """One-sided p-value for the hypothesis that b is slower than a."""
+    n1, n2 = len(a), len(b)
+    ranked = sorted([(v, 0) for v in a] + [(v, 1) for v in b])
+
+    # average ranks over ties
+    ranks = [0.0] * len(ranked)
+    tie_correction = 0
+    idx = 0
+    while idx < len(ranked):
+        end = idx
+        while end + 1 < len(ranked) and ranked[end + 1][0] == ranked[idx][0]:
+            end += 1
+        for k in range(idx, end + 1):
+            ranks[k] = (idx + end) / 2 + 1
+        tie_count = end - idx + 1
+        tie_correction += tie_count**3 - tie_count
+        idx = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, ranked) if group == 1)
+    u = rank_sum - n2 * (n2 + 1) / 2
+
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_correction / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(baseline: dict[str, dict], results: list[BenchResult]) -> list[Comparison]:
+    comparisons = []
+    for result in results:
+        if (base := baseline.get(result.label)) is None:
+            continue
+        comparisons.append(
+            Comparison(
+                label=result.label,
+                baseline=base["median"],
+                current=result.median,
+                p_value=mann_whitney_p_value(base["samples"], result.samples),
+            )
+        )
+    return comparisons
+
+
+def load_results(path: Path) -> dict[str, dict]:
+    return json.loads(path.read_text())["results"]
+
+
+def save_results(path: Path, results: list[BenchResult], warmup: int):
+    data = {
+        "python": sys.version.split()[0],
+        "warmup": warmup,
+        "results": {result.label: result.to_dict() for result in results},
+    }
+    path.write_text(json.dumps(data, indent=2))
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Benchmark resolve functions")
+    parser.add_argument("-y", "--year", action="append", dest="years")
+    parser.add_argument("-d", "--day", action="append", dest="days")
+    parser.add_argument("-p", "--part", action="append", dest="parts", type=int)
+    parser.add_argument("-w", "--warmup", type=int, default=1)
+    parser.add_argument("-n", "--samples", type=int, default=10)
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("-c", "--compare", type=Path, help="baseline results file")
+    parser.add_argument(
+        "--parse-cache",
+        action="store_true",
+        help="load parsed inputs from their binary cache instead of the text",
+    )
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.05,
+        help="minimum relative slowdown of the median to report",
+    )
+    args = parser.parse_args(argv)
+
+    days = [day.zfill(2) for day in args.days] if args.days else None
+    entry_points = [
+        entry_point
+        for entry_point in discover(args.years or DEFAULT_YEARS, days, args.parts)
+        if entry_point.path.name == "run.py"
+    ]
+
+    results = []
+    errors = 0
+    for entry_point in entry_points:
+        result = bench_entry_point(
+            entry_point, args.warmup, args.samples, args.parse_cache
+        )
+        if result.error is not None:
+            # a failing solver is left out of the results, not the whole run
+            print(f"{result.label:<36}{result.error}", flush=True)
+            errors += 1
+            continue
+        print(
+            f"{result.label:<36}"
+            f"median {result.median * 1000:>10.3f}ms  "
+            f"iqr {result.iqr * 1000:>8.3f}ms",
+            flush=True,
+        )
+        results.append(result)
+
+    save_results(args.output, results, args.warmup)
+
+    if args.compare is None:
+        return 1 if errors else 0
+
+    regressions = 0
+    for comparison in compare(load_results(args.compare), results):
+        is_regression = (
+            comparison.p_value < args.alpha and comparison.ratio > 1 + args.threshold
+        )
+        regressions += is_regression
+        print(
+            f"{comparison.label:<36}"
+            f"{comparison.baseline * 1000:>10.3f}ms -> "
+            f"{comparison.current * 1000:>10.3f}ms  "
+            f"x{comparison.ratio:.2f}  p={comparison.p_value:.4f}"
+            f"{'  REGRESSION' if is_regression else ''}"
+        )
+    return 1 if regressions or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
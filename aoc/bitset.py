@@ -0,0 +1,138 @@
+from collections.abc import Iterable, Iterator
+
+Pos = tuple[int, int]
+
+
+class PosSet:
+    """Set of grid positions stored as one bit per cell in a `bytearray`.
+
+    A drop-in replacement for the `set[Pos]` visited sets of the solvers:
+    `add`, `discard` and `in` are O(1), set algebra and `len` go through one
+    big int so they run at C speed, and a million cells fit in 125 KB.
+    Positions are `(row, col)` in a `height` x `width` grid; the `*_index`
+    methods take the flat `row * width + col` index instead.
+    """
+
+    __slots__ = ("height", "width", "data")
+
+    def __init__(self, height: int, width: int, positions: Iterable[Pos] = ()):
+        self.height = height
+        self.width = width
+        self.data = bytearray((height * width + 7) >> 3)
+        self.update(positions)
+
+    def _empty(self) -> "PosSet":
+        return PosSet(self.height, self.width)
+
+    def _index(self, pos: Pos) -> int:
+        x, y = pos
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            raise IndexError(f"{pos} out of a {self.height}x{self.width} grid")
+        return x * self.width + y
+
+    def _check_shape(self, other: "PosSet"):
+        if (self.height, self.width) != (other.height, other.width):
+            raise ValueError(
+                f"Cannot combine a {self.height}x{self.width} PosSet "
+                f"with a {other.height}x{other.width} one"
+            )
+
+    def _to_int(self) -> int:
+        return int.from_bytes(self.data, "little")
+
+    def _from_int(self, bits: int) -> "PosSet":
+        res = self._empty()
+        res.data[:] = bits.to_bytes(len(self.data), "little")
+        return res
+
+    def add_index(self, index: int):
+        self.data[index >> 3] |= 1 << (index & 7)
+
+    def discard_index(self, index: int):
+        self.data[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def has_index(self, index: int) -> bool:
+        return bool(self.data[index >> 3] >> (index & 7) & 1)
+
+    def add(self, pos: Pos):
+        self.add_index(self._index(pos))
+
+    def discard(self, pos: Pos):
+        self.discard_index(self._index(pos))
+
+    def update(self, positions: Iterable[Pos]):
+        data = self.data
+        for pos in positions:
+            index = self._index(pos)
+            data[index >> 3] |= 1 << (index & 7)
+
+    def __contains__(self, pos: Pos) -> bool:
+        x, y = pos
+        # like a set, positions out of the grid are never in it
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            return False
+        index = x * self.width + y
+        return bool(self.data[index >> 3] >> (index & 7) & 1)
+
+    def __len__(self) -> int:
+        return self._to_int().bit_count()
+
+    def __bool__(self) -> bool:
+        return any(self.data)
+
+    def indexes(self) -> Iterator[int]:
+        for byte_index, byte in enumerate(self.data):
+            if byte:
+                base = byte_index << 3
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + bit
+
+    def __iter__(self) -> Iterator[Pos]:
+        width = self.width
+        for index in self.indexes():
+            yield divmod(index, width)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PosSet):
+            return NotImplemented
+        shape, other_shape = (self.height, self.width), (other.height, other.width)
+        return shape == other_shape and self.data == other.data
+
+    def __or__(self, other: "PosSet") -> "PosSet":
+        self._check_shape(other)
+        return self._from_int(self._to_int() | other._to_int())
+
+    def __and__(self, other: "PosSet") -> "PosSet":
+        self._check_shape(other)
+        return self._from_int(self._to_int() & other._to_int())
+
+    def __sub__(self, other: "PosSet") -> "PosSet":
+        self._check_shape(other)
+        return self._from_int(self._to_int() & ~other._to_int())
+
+    def __xor__(self, other: "PosSet") -> "PosSet":
+        self._check_shape(other)
+        return self._from_int(self._to_int() ^ other._to_int())
+
+    def __ior__(self, other: "PosSet") -> "PosSet":
+        self._check_shape(other)
+        self.data[:] = (self._to_int() | other._to_int()).to_bytes(
+            len(self.data), "little"
+        )
+        return self
+
+    def __iand__(self, other: "PosSet") -> "PosSet":
+        self._check_shape(other)
+        self.data[:] = (self._to_int() & other._to_int()).to_bytes(
+            len(self.data), "little"
+        )
+        return self
+
+    def copy(self) -> "PosSet":
+        res = self._empty()
+        res.data[:] = self.data
+        return res
+
+    def __repr__(self) -> str:
+        return f"PosSet({self.height}, {self.width}, {list(self)})"
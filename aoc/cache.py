@@ -0,0 +1,129 @@
+import argparse
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+
+from aoc.runner import ROOT, EntryPoint
+from aoc.sources import update_with_shared_code
+
+CACHE_DIR = ROOT / ".aoc_cache" / "results"
+MAX_CACHE_SIZE = 64 * 2**20  # bytes
+# written by the solvers or the tooling while running
+IGNORED_SUFFIXES = {".checkpoint", ".tmp", ".pyc"}
+
+
+class ResultCache:
+    """On-disk store of puzzle answers keyed by solver source, shared `aoc`
+    code and day data files hash.
+
+    Entries are evicted least recently used first once the total size exceeds
+    `max_size`; the file modification time tracks the last access.
+    """
+
+    def __init__(self, directory: Path = CACHE_DIR, max_size: int = MAX_CACHE_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+
+    @staticmethod
+    def key(entry_point: EntryPoint) -> str:
+        digest = hashlib.sha256()
+        digest.update(entry_point.name.encode())
+        digest.update(entry_point.path.read_bytes())
+        update_with_shared_code(digest)
+        # solvers pick their data files themselves, so hash every file of the
+        # day (sibling modules included), but not the caches and checkpoints
+        # written next to them
+        day_dir = entry_point.path.parent
+        for path in sorted(day_dir.rglob("*")):
+            relative = path.relative_to(day_dir)
+            if (
+                path.is_file()
+                and "__pycache__" not in relative.parts
+                and not relative.name.startswith(".")
+                and path.suffix not in IGNORED_SUFFIXES
+            ):
+                digest.update(str(relative).encode())
+                digest.update(path.read_bytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def prefix(entry_point: EntryPoint) -> str:
+        return f"{entry_point.year}_{entry_point.day}_{entry_point.path.stem}"
+
+    def path(self, entry_point: EntryPoint) -> Path:
+        name = f"{self.prefix(entry_point)}.{entry_point.name}.{self.key(entry_point)}"
+        return self.directory / f"{name}.pkl"
+
+    def get(self, entry_point: EntryPoint) -> tuple[bool, object]:
+        path = self.path(entry_point)
+        try:
+            value = pickle.loads(path.read_bytes())
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            return False, None
+        os.utime(path)
+        return True, value
+
+    def put(self, entry_point: EntryPoint, value: object):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # an edited solver or input leaves stale entries behind
+        for stale in self.directory.glob(
+            f"{self.prefix(entry_point)}.{entry_point.name}.*.pkl"
+        ):
+            stale.unlink(missing_ok=True)
+
+        path = self.path(entry_point)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path.replace(path)
+        self.evict()
+
+    def entries(self) -> list[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if total <= self.max_size:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+    def invalidate(self, year: str | None = None, day: str | None = None) -> int:
+        pattern = f"{year or '*'}_{day or '*'}_*.pkl"
+        count = 0
+        if self.directory.exists():
+            for path in self.directory.glob(pattern):
+                path.unlink(missing_ok=True)
+                count += 1
+        return count
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Manage the puzzle result cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    invalidate_parser = subparsers.add_parser("invalidate")
+    invalidate_parser.add_argument("target", nargs="?", help="<year> or <year>/<day>")
+    subparsers.add_parser("list")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache()
+    if args.command == "invalidate":
+        year, _, day = (args.target or "").partition("/")
+        count = cache.invalidate(year or None, day.zfill(2) if day else None)
+        print(f"removed {count} entries")
+    elif args.command == "list":
+        entries = cache.entries()
+        for path in entries:
+            print(f"{path.stat().st_size:>8}  {path.name}")
+        print(f"{sum(path.stat().st_size for path in entries)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
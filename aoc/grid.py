@@ -0,0 +1,145 @@
+from collections.abc import Iterable, Iterator, Sequence
+
+Pos = tuple[int, int]
+
+# value of the border cells, out of the range of both ASCII text and digits
+SENTINEL = 0xFF
+
+
+class Grid:
+    """Rectangular grid stored row-major in a flat `bytearray`.
+
+    The grid is surrounded by a one-cell border filled with `SENTINEL`, so a
+    neighbor of any inner cell is always a valid index: hot loops compare the
+    cell value instead of checking bounds. Cells are addressed either by
+    `(row, col)` positions or by flat indexes, and `UP`, `RIGHT`, `DOWN` and
+    `LEFT` are the flat offsets of the four directions.
+
+    Text grids store the byte of each character, int grids (digits) the value
+    itself; `get` and the `to_*` adapters decode back to the original type.
+    """
+
+    def __init__(self, height: int, width: int, is_text: bool = True):
+        self.height = height
+        self.width = width
+        self.is_text = is_text
+        self.stride = width + 2
+        self.data = bytearray([SENTINEL]) * (self.stride * (height + 2))
+
+        self.UP, self.RIGHT, self.DOWN, self.LEFT = -self.stride, 1, self.stride, -1
+        # same order as the (row, col) DIRECTIONS of the solvers: up, right, down, left
+        self.offsets = (self.UP, self.RIGHT, self.DOWN, self.LEFT)
+        self.diagonal_offsets = tuple(
+            dx * self.stride + dy for dx in (-1, 1) for dy in (-1, 1)
+        )
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "Grid":
+        """`list[str]` or `list[list[str]]` grids of ASCII characters."""
+        rows = ["".join(line) for line in lines]
+        grid = cls(len(rows), len(rows[0]) if rows else 0)
+        for row, line in enumerate(rows):
+            grid.set_row(row, line.encode("ascii"))
+        return grid
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence[int]]) -> "Grid":
+        """`list[list[int]]` or `tuple[tuple[int]]` grids of values in 0..254."""
+        grid = cls(len(rows), len(rows[0]) if rows else 0, is_text=False)
+        for row, values in enumerate(rows):
+            values = bytes(values)
+            # a 255 cell would read as the border
+            if SENTINEL in values:
+                raise ValueError(f"Row {row} holds {SENTINEL}, the border value")
+            grid.set_row(row, values)
+        return grid
+
+    def to_lines(self) -> list[str]:
+        return [bytes(self.row(row)).decode() for row in range(self.height)]
+
+    def to_rows(self) -> list[list]:
+        if self.is_text:
+            return [list(line) for line in self.to_lines()]
+        return [list(self.row(row)) for row in range(self.height)]
+
+    def set_row(self, row: int, values: bytes):
+        # a slice assignment of another length would resize the flat buffer
+        if len(values) != self.width:
+            raise ValueError(
+                f"Row {row} has {len(values)} cells, expected {self.width}"
+            )
+        start = self.index((row, 0))
+        self.data[start : start + self.width] = values
+
+    def row(self, row: int) -> bytearray:
+        start = self.index((row, 0))
+        return self.data[start : start + self.width]
+
+    def index(self, pos: Pos) -> int:
+        return (pos[0] + 1) * self.stride + pos[1] + 1
+
+    def pos(self, index: int) -> Pos:
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __contains__(self, pos: Pos) -> bool:
+        return 0 <= pos[0] < self.height and 0 <= pos[1] < self.width
+
+    def __getitem__(self, pos: Pos | int) -> int:
+        """Raw cell value, `SENTINEL` on the border."""
+        if isinstance(pos, tuple):
+            pos = self.index(pos)
+        return self.data[pos]
+
+    def __setitem__(self, pos: Pos | int, value: int | str):
+        if isinstance(pos, tuple):
+            pos = self.index(pos)
+        self.data[pos] = ord(value) if isinstance(value, str) else value
+
+    def get(self, pos: Pos | int) -> str | int:
+        value = self[pos]
+        return chr(value) if self.is_text else value
+
+    def indexes(self) -> Iterator[int]:
+        """Flat indexes of the inner cells, row by row."""
+        for row in range(self.height):
+            start = self.index((row, 0))
+            yield from range(start, start + self.width)
+
+    def neighbors(self, index: int) -> list[int]:
+        data = self.data
+        return [
+            index + offset
+            for offset in self.offsets
+            if data[index + offset] != SENTINEL
+        ]
+
+    def find(self, value: int | str) -> int:
+        """Flat index of the first cell holding `value`, -1 if none."""
+        if isinstance(value, str):
+            value = ord(value)
+        return self.data.find(value)
+
+    def find_all(self, value: int | str) -> list[int]:
+        if isinstance(value, str):
+            value = ord(value)
+        data = self.data
+        return [index for index in self.indexes() if data[index] == value]
+
+    def copy(self) -> "Grid":
+        grid = Grid(self.height, self.width, self.is_text)
+        grid.data[:] = self.data
+        return grid
+
+    def as_numpy(self, padded: bool = False):
+        """Writable `uint8` view over the buffer, without the border unless
+        `padded`."""
+        import numpy as np
+
+        array = np.frombuffer(self.data, dtype=np.uint8).reshape(
+            self.height + 2, self.stride
+        )
+        return array if padded else array[1:-1, 1:-1]
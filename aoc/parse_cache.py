@@ -0,0 +1,72 @@
+import hashlib
+import inspect
+import pickle
+from functools import wraps
+from pathlib import Path
+from types import ModuleType
+from typing import Callable
+
+from aoc.sources import update_with_shared_code
+
+PARSER_NAMES = ("parse_input",)
+
+
+def cache_path(input_path: Path, parser: Callable, digest: str) -> Path:
+    return input_path.with_name(
+        f".{input_path.name}.{parser.__name__}.{digest}.parsed.pkl"
+    )
+
+
+def file_digest(input_path: Path, parser: Callable) -> str:
+    digest = hashlib.sha256(input_path.read_bytes())
+    # hash the whole solver file and the shared aoc code: an edited parser,
+    # helper or pickled class (e.g. aoc.grid.Grid) must not be served the
+    # structure of its previous version
+    digest.update(Path(inspect.getfile(parser)).read_bytes())
+    update_with_shared_code(digest)
+    return digest.hexdigest()[:16]
+
+
+def load(input_path: Path, parser: Callable, digest: str):
+    return pickle.loads(cache_path(input_path, parser, digest).read_bytes())
+
+
+def dump(input_path: Path, parser: Callable, digest: str, value):
+    for stale in input_path.parent.glob(f".{input_path.name}.{parser.__name__}.*"):
+        stale.unlink(missing_ok=True)
+    # protocol 5 writes bytearrays (Grid, PosSet) and arrays as raw buffers
+    path = cache_path(input_path, parser, digest)
+    path.write_bytes(pickle.dumps(value, protocol=5))
+
+
+def cached_parse(parser: Callable) -> Callable:
+    """Wrap a `parse_input(path)` function so that its result is stored in a
+    binary file next to the input and reloaded while the input is unchanged."""
+    base_dir = Path(inspect.getfile(parser)).resolve().parent
+
+    @wraps(parser)
+    def wrapper(path: str, *args, **kwargs):
+        if args or kwargs:
+            return parser(path, *args, **kwargs)
+
+        input_path = base_dir / path
+        digest = file_digest(input_path, parser)
+        try:
+            return load(input_path, parser, digest)
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError):
+            pass
+
+        value = parser(path)
+        dump(input_path, parser, digest, value)
+        return value
+
+    return wrapper
+
+
+def install(module: ModuleType):
+    """Swap the module's parsers for cached ones. Solvers look their parser up
+    as a module global at call time, so they pick the wrapper up unchanged."""
+    for name in PARSER_NAMES:
+        parser = getattr(module, name, None)
+        if callable(parser) and not hasattr(parser, "__wrapped__"):
+            setattr(module, name, cached_parse(parser))
@@ -0,0 +1,83 @@
+import importlib.util
+import inspect
+import os
+import pickle
+import sys
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+
+# set by the runner, which already keeps every core busy with one part each
+WORKERS_ENV = "AOC_POOL_WORKERS"
+
+_worker_func: Callable | None = None
+_worker_state: object = None
+
+
+def default_workers() -> int:
+    return int(os.environ.get(WORKERS_ENV, 0)) or os.cpu_count()
+
+
+def find_module(name: str, path: str) -> ModuleType:
+    # day modules are loaded from their path under a name (or as __main__)
+    # that a spawned worker can't import: load them again from their file
+    # under the same name, so that the state unpickles to their classes
+    module = sys.modules.get(name)
+    if module is not None and getattr(module, "__file__", None) == path:
+        return module
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def init_worker(module_name: str, path: str, func_name: str, state: bytes):
+    global _worker_func, _worker_state
+    _worker_func = getattr(find_module(module_name, path), func_name)
+    _worker_state = pickle.loads(state)
+
+
+def get_executor(func: Callable, workers: int) -> ProcessPoolExecutor:
+    """Process pool whose workers can unpickle `func` (or a partial of it) and
+    the objects of its module, whatever the start method."""
+    func = getattr(func, "func", func)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=find_module,
+        initargs=(func.__module__, inspect.getfile(func)),
+    )
+
+
+def run_chunk(chunk: Sequence) -> object:
+    return _worker_func(_worker_state, chunk)
+
+
+def map_chunks(
+    func: Callable[[object, Sequence], object],
+    state: object,
+    items: Sequence,
+    workers: int | None = None,
+) -> list:
+    """`func(state, chunk)` for one interleaved chunk of `items` per worker,
+    over a process pool with the platform's default start method.
+
+    `state` is sent once per worker instead of with every chunk, and `func`
+    must be a top-level function of its module. With a single worker, the
+    chunk runs in the current process."""
+    workers = workers or default_workers()
+    chunks = [chunk for idx in range(workers) if (chunk := items[idx::workers])]
+    if workers == 1:
+        return [func(state, chunk) for chunk in chunks]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=init_worker,
+        initargs=(
+            func.__module__,
+            inspect.getfile(func),
+            func.__name__,
+            pickle.dumps(state),
+        ),
+    ) as executor:
+        return list(executor.map(run_chunk, chunks))
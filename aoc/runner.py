@@ -0,0 +1,226 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import re
+import resource
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+from aoc import parse_cache as parse_cache_module
+from aoc.pool import WORKERS_ENV
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# resolve1, resolve2, resolve_part1, resolve2_better, ...
+ENTRY_POINT_RE = re.compile(r"^resolve_?(?:part)?(\d)(?:_\w+)?$")
+
+
+@dataclass(frozen=True)
+class EntryPoint:
+    path: Path
+    name: str
+    part: int
+
+    @property
+    def year(self) -> str:
+        return self.path.parent.parent.name
+
+    @property
+    def day(self) -> str:
+        return self.path.parent.name
+
+    @property
+    def label(self) -> str:
+        return f"{self.year}/{self.day}/{self.path.stem}.{self.name}"
+
+
+@dataclass
+class RunResult:
+    entry_point: EntryPoint
+    value: object = None
+    error: str | None = None
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    peak_memory: int = 0  # bytes
+    cached: bool = False
+
+
+def iter_modules(years: list[str] | None = None, days: list[str] | None = None):
+    for year_dir in sorted(ROOT.glob("[0-9][0-9][0-9][0-9]")):
+        if years and year_dir.name not in years:
+            continue
+        for day_dir in sorted(year_dir.glob("[0-9][0-9]")):
+            if days and day_dir.name not in days:
+                continue
+            for path in sorted(day_dir.glob("*.py")):
+                if not path.name.startswith("test_"):
+                    yield path
+
+
+def module_name(path: Path) -> str:
+    return f"aoc_{path.parent.parent.name}_{path.parent.name}_{path.stem}"
+
+
+def load_module(path: Path) -> ModuleType:
+    name = module_name(path)
+    if (module := sys.modules.get(name)) is not None:
+        return module
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # registered before exec so that dataclasses and pickling can find it
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def find_entry_points(path: Path) -> list[EntryPoint]:
+    # parse the source instead of importing it: the parent process should not
+    # pay for every module's import-time side effects
+    entry_points = []
+    for match in re.finditer(r"^def (\w+)\(\)", path.read_text(), re.MULTILINE):
+        name = match.group(1)
+        if part_match := ENTRY_POINT_RE.match(name):
+            entry_points.append(EntryPoint(path, name, int(part_match.group(1))))
+    return entry_points
+
+
+def discover(
+    years: list[str] | None = None,
+    days: list[str] | None = None,
+    parts: list[int] | None = None,
+) -> list[EntryPoint]:
+    return [
+        entry_point
+        for path in iter_modules(years, days)
+        for entry_point in find_entry_points(path)
+        if not parts or entry_point.part in parts
+    ]
+
+
+def cpu_time() -> float:
+    # include the waited-for children of the solvers running their own pool
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def run_entry_point(entry_point: EntryPoint, parse_cache=False) -> RunResult:
+    # some solvers open their input relative to the repository root
+    os.chdir(ROOT)
+    result = RunResult(entry_point)
+
+    wall_start, cpu_start = time.perf_counter(), cpu_time()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module = load_module(entry_point.path)
+            if parse_cache:
+                parse_cache_module.install(module)
+            func = getattr(module, entry_point.name)
+            result.value = func()
+    except Exception:
+        result.error = traceback.format_exc(limit=-1).strip().splitlines()[-1]
+    result.wall_time = time.perf_counter() - wall_start
+    result.cpu_time = cpu_time() - cpu_start
+
+    # each task runs in its own process, so the high-water mark is the part's,
+    # or the one of the largest worker of a solver with its own pool
+    result.peak_memory = 1024 * max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return result
+
+
+def set_pool_workers(pool_workers: str):
+    # in the part process only, inherited by the pools of the solvers
+    os.environ[WORKERS_ENV] = pool_workers
+
+
+def run_all(
+    entry_points: list[EntryPoint],
+    workers: int | None = None,
+    use_cache=True,
+    parse_cache=False,
+):
+    # imported here as the cache module depends on this one
+    from aoc.cache import ResultCache
+
+    cache = ResultCache() if use_cache else None
+
+    pending = []
+    for entry_point in entry_points:
+        if cache is not None:
+            hit, value = cache.get(entry_point)
+            if hit:
+                yield RunResult(entry_point, value, cached=True)
+                continue
+        pending.append(entry_point)
+
+    # the parts already share the cores: solvers with their own pool get the
+    # rest, unless set by the user
+    workers = workers or os.cpu_count()
+    pool_workers = os.environ.get(WORKERS_ENV) or str(max(1, os.cpu_count() // workers))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        max_tasks_per_child=1,
+        initializer=set_pool_workers,
+        initargs=(pool_workers,),
+    ) as executor:
+        futures = [executor.submit(run_entry_point, ep, parse_cache) for ep in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            if cache is not None and result.error is None:
+                cache.put(result.entry_point, result.value)
+            yield result
+
+
+def format_result(result: RunResult) -> str:
+    value = result.error if result.error is not None else result.value
+    if result.cached:
+        return f"{result.entry_point.label:<36}{'(cached)':>34}  {value}"
+    return (
+        f"{result.entry_point.label:<36}"
+        f"{result.wall_time:>10.3f}s"
+        f"{result.cpu_time:>10.3f}s"
+        f"{result.peak_memory / 2**20:>10.1f}MB"
+        f"  {value}"
+    )
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="Run every puzzle in parallel")
+    parser.add_argument("-y", "--year", action="append", dest="years")
+    parser.add_argument("-d", "--day", action="append", dest="days")
+    parser.add_argument("-p", "--part", action="append", dest="parts", type=int)
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--no-cache", action="store_false", dest="use_cache")
+    parser.add_argument("--parse-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    days = [day.zfill(2) for day in args.days] if args.days else None
+    entry_points = discover(args.years, days, args.parts)
+
+    print(f"{'part':<36}{'wall':>11}{'cpu':>11}{'peak mem':>12}  answer")
+    start = time.perf_counter()
+    results = []
+    for result in run_all(entry_points, args.workers, args.use_cache, args.parse_cache):
+        print(format_result(result), flush=True)
+        results.append(result)
+
+    total_cpu = sum(result.cpu_time for result in results)
+    print(
+        f"{len(results)} parts in {time.perf_counter() - start:.3f}s "
+        f"(cpu {total_cpu:.3f}s)"
+    )
+    return 1 if any(result.error for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
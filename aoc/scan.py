@@ -0,0 +1,149 @@
+import hashlib
+import pickle
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+
+from aoc.pool import default_workers, get_executor
+
+Range = tuple[int, int]  # start, length
+
+
+@dataclass
+class Checkpoint:
+    signature: str
+    result: object
+    done: set[int] = field(default_factory=set)  # indexes of finished shards
+    elapsed: float = 0.0  # seconds, over all runs
+
+
+def split_ranges(ranges: list[Range], shard_size: int) -> list[Range]:
+    return [
+        (shard_start, min(shard_size, start + length - shard_start))
+        for start, length in ranges
+        for shard_start in range(start, start + length, shard_size)
+    ]
+
+
+def get_signature(shards: list[Range], func: Callable, key: bytes) -> str:
+    digest = hashlib.sha256(repr(shards).encode())
+    # a partial carries its bound data: other maps mean another result
+    digest.update(pickle.dumps(func))
+    digest.update(key)
+    return digest.hexdigest()
+
+
+def load_checkpoint(path: Path | None, signature: str) -> Checkpoint | None:
+    if path is None or not path.exists():
+        return None
+    checkpoint = pickle.loads(path.read_bytes())
+    # the checkpoint of another scan (other ranges, shard size, function or
+    # key) is ignored
+    return checkpoint if checkpoint.signature == signature else None
+
+
+def save_checkpoint(path: Path | None, checkpoint: Checkpoint):
+    if path is None:
+        return
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_bytes(pickle.dumps(checkpoint))
+    tmp_path.replace(path)
+
+
+def print_progress(op_count: int, total: int, run_op_count: int, run_duration: float):
+    ratio = op_count / total if total else 1.0
+    # rate of this run only: resumed values were done by an earlier process
+    rate = run_op_count / run_duration if run_duration else 0.0
+    eta = (total - op_count) / rate if rate else 0.0
+    eta_str = str(timedelta(seconds=int(eta)))
+    print(f"op_count: {op_count},\tpercent: {ratio * 100:.2f}%\tETA: {eta_str}")
+
+
+def scan_ranges(
+    func: Callable[[int, int], object],
+    ranges: list[Range],
+    combine: Callable[[object, object], object],
+    initial: object,
+    checkpoint_path: Path | str | None = None,
+    workers: int | None = None,
+    shard_size: int = 1_000_000,
+    checkpoint_interval: float = 10.0,
+    progress_interval: float | None = 5.0,
+    key: bytes = b"",
+):
+    """Apply `func(start, length)` to every `(start, length)` range, split in
+    shards of `shard_size` values spread over a process pool, and fold the
+    partial results with `combine`, starting from `initial`.
+
+    The finished shards and the current result are written to
+    `checkpoint_path` every `checkpoint_interval` seconds and on Ctrl-C, so a
+    killed scan picks up where it stopped when run again with the same ranges
+    and the same pickled `func`. `key` is hashed along, e.g. the source of the
+    caller so that editing it discards the checkpoint. `func` must be a
+    top-level function of its module, or a partial of one.
+    """
+    checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+    shards = split_ranges(ranges, shard_size)
+    signature = get_signature(shards, func, key)
+    checkpoint = load_checkpoint(checkpoint_path, signature) or Checkpoint(
+        signature, initial
+    )
+
+    total = sum(length for _, length in shards)
+    start_op_count = op_count = sum(shards[idx][1] for idx in checkpoint.done)
+    pending = deque(idx for idx in range(len(shards)) if idx not in checkpoint.done)
+
+    previous_elapsed = checkpoint.elapsed
+    start_time = time.time()
+    last_checkpoint = last_progress = start_time
+
+    workers = workers or default_workers()
+    # bounded number of shards in flight so that Ctrl-C stops quickly
+    max_in_flight = 2 * workers
+    with get_executor(func, workers) as executor:
+        in_flight = {}
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < max_in_flight:
+                    idx = pending.popleft()
+                    in_flight[executor.submit(func, *shards[idx])] = idx
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    idx = in_flight.pop(future)
+                    checkpoint.result = combine(checkpoint.result, future.result())
+                    checkpoint.done.add(idx)
+                    op_count += shards[idx][1]
+
+                now = time.time()
+                checkpoint.elapsed = previous_elapsed + now - start_time
+                if now - last_checkpoint >= checkpoint_interval:
+                    save_checkpoint(checkpoint_path, checkpoint)
+                    last_checkpoint = now
+                if (
+                    progress_interval is not None
+                    and now - last_progress >= progress_interval
+                ):
+                    print_progress(
+                        op_count, total, op_count - start_op_count, now - start_time
+                    )
+                    last_progress = now
+
+        except KeyboardInterrupt:
+            for future in in_flight:
+                future.cancel()
+            checkpoint.elapsed = previous_elapsed + time.time() - start_time
+            save_checkpoint(checkpoint_path, checkpoint)
+            print(
+                f"interrupted after {op_count}/{total} values, "
+                f"result so far: {checkpoint.result}"
+            )
+            raise
+
+    if checkpoint_path is not None:
+        checkpoint_path.unlink(missing_ok=True)
+    return checkpoint.result